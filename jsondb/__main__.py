@@ -430,7 +430,7 @@ whitespace)
                         db.edit_id(id_choice, tags=tags)
                     elif choice.lower().startswith("r "):
                         tags_to_remove = choice.split()[1:]
-                        original_tags = db.at_index(id_choice)[1]
+                        original_tags = set(db.at_index(id_choice)[1])
                         for tag in tags_to_remove:
                             with suppress(KeyError):
                                 original_tags.remove(tag)
@@ -454,7 +454,7 @@ whitespace)
                         )
                     elif choice.lower().startswith("u "):
                         attrs_to_remove = choice.split()[1:]
-                        original_attrs = db.at_index(id_choice)[2]
+                        original_attrs = dict(db.at_index(id_choice)[2])
                         for attr in attrs_to_remove:
                             original_attrs.pop(attr)
                         db.edit_id(id_choice, attrs=original_attrs)
@@ -1,38 +1,301 @@
 import json
 import os
 import re
-import sys
+import shutil
 import time
-from contextlib import contextmanager
+import uuid
+from contextlib import contextmanager, suppress
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Generator, Iterable, Optional, Union
+from typing import (Any, BinaryIO, Callable, Generator, Iterable, Optional,
+                    Union)
 
 from .version import __version__, version_string
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 TAGS = set[str]
+ENTRY_TAGS = frozenset[str]
 ENFORCE_TAGS = bool
 BACKUPS_ENABLED = bool
 ATTRS = dict[str, Union[str, int, float, bool]]
-DATA_ENTRY = tuple[str, TAGS, ATTRS]
+DATA_ENTRY = tuple[str, ENTRY_TAGS, ATTRS]
 DATA = list[DATA_ENTRY]
+TAG_INDEX = dict[str, set[int]]
+DATA_INDEX = dict[str, int]
 VERSION = str
+WAL_ID = Optional[str]
+# Inode, size and modification time of a file, see `_file_state()`
+FILE_STATE = tuple[int, int, int]
 STRUCTURE = dict[
     str,
-    Union[TAGS, DATA, ENFORCE_TAGS, BACKUPS_ENABLED, VERSION]
+    Union[TAGS, DATA, ENFORCE_TAGS, BACKUPS_ENABLED, VERSION, WAL_ID]
 ]
 
 DEFAULT_FORMAT_STRING = '[%id(3)] "%data()" [%tags(", ")] {%attrs(": ","; ")}'
 JSONDB_HOME_PATH = Path.home() / "Documents" / "jsondb"
 
+# The write-ahead log is merged into the database file once it exceeds this
+# fraction of the file's size, see `Database.save()`
+WAL_COMPACTION_RATIO = 0.25
+
+# The modification time of the .paths.json register file and the databases
+# it held back then, see `_load_paths()`
+_PATHS_CACHE: tuple[int, dict[str, str]] = (-1, {})
+
+# Used to parse the keys preceding the data in a database file, see
+# `_split_structure()`
+_DECODER = json.JSONDecoder()
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_HEADER_KEYS = frozenset(
+    {"tags", "enforce_tags", "backups_enabled", "version"}
+)
+
+# Types an attribute value may have, see `Database.set()`
+_ATTR_TYPES = (str, int, float, bool)
+# The exact types are checked first, which is a single hash lookup
+_ATTR_EXACT_TYPES = frozenset(_ATTR_TYPES)
+# orjson reads integers beyond 64 bits as floats, so json containing digits
+# as long as those is parsed by the json module instead, see `_loads()`
+_LONG_DIGITS_RE = re.compile(r"\d{20}")
+_LONG_DIGITS_BYTES_RE = re.compile(rb"\d{20}")
+
+# One alternative per format macro, see `Database.format()`. The outer group
+# names the macro (available as `match.lastgroup`), the inner ones its args.
+_FMT_RE = re.compile(
+    r"(?P<id>%id\((?P<id_width>\d*)(?:,\s*\"(?P<id_fill>.*?)\")?\))"
+    r"|(?P<data>%data\((?P<data_width>\d*)"
+    r"(?:,\s*\"(?P<data_fill>.*?)\")?\))"
+    r"|(?P<tags>%tags\(\"(?P<tags_sep>.*?)\"\))"
+    r"|(?P<attrs>%attrs\(\"(?P<attrs_sep1>.*?)\",\s*"
+    r"\"(?P<attrs_sep2>.*?)\"\))"
+)
+
+# Logged changes of the entries, which `Database._replay()` applies itself,
+# and the methods changing the allowed tags, which it calls by name
+_ENTRY_OPS = frozenset({"set", "unset", "edit_id"})
+# How the lines of those start, with or without orjson
+_ENTRY_OP_PREFIXES = tuple(f'["{op}"'.encode("ascii") for op in _ENTRY_OPS)
+_TAG_OPS = frozenset(
+    {"add_tag", "rm_tag", "clear_tags", "add_tags", "rm_tags"}
+)
+
+# Group 1: Database name | Group 2: Timestamp
+_BACKUP_RE = re.compile(r"^\.jsondb_backup_(.+)_(\d+)\.jsondb$")
+
+FORMAT_PART = Union[str, Callable[[int, DATA_ENTRY], str]]
+
+
+def _compile_macro(match: re.Match[str]) -> Callable[[int, DATA_ENTRY], str]:
+    """Create a function rendering a format macro for an id and an entry."""
+    kind = match.lastgroup
+    if kind == "id":
+        id_spec = f"{match.group('id_fill') or '0'}>{match.group('id_width')}"
+        return lambda id, entry: format(id, id_spec)
+    if kind == "data":
+        data_spec = (
+            f"{match.group('data_fill') or ' '}<{match.group('data_width')}"
+        )
+        return lambda id, entry: format(entry[0], data_spec)
+    if kind == "tags":
+        sep = match.group("tags_sep")
+        return lambda id, entry: sep.join(entry[1])
+    sep1 = match.group("attrs_sep1")
+    sep2 = match.group("attrs_sep2")
+    return lambda id, entry: sep2.join(
+        f"{key}{sep1}{value}" for key, value in entry[2].items()
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_fmt(fmt_string: str) -> tuple[FORMAT_PART, ...]:
+    """
+    Compile a format string (see `Database.format()`) into its literal text
+    and functions rendering the macros, so it only has to be parsed once.
+    The result is cached, since mostly the same few format strings are used.
+    """
+    parts: list[FORMAT_PART] = []
+    pos = 0
+    for match in _FMT_RE.finditer(fmt_string):
+        if match.start() > pos:
+            parts.append(fmt_string[pos:match.start()])
+        parts.append(_compile_macro(match))
+        pos = match.end()
+    if pos < len(fmt_string):
+        parts.append(fmt_string[pos:])
+    return tuple(parts)
+
+
+def _check_attrs(attrs: ATTRS) -> None:
+    """
+    Make sure all attributes are of a type a database can store.
+
+    :raises TypeError: At least one attribute key is not a string
+    :raises TypeError: At least one attribute value is not of type str,
+    int, float or bool
+    """
+    for key, value in attrs.items():
+        if not isinstance(key, str):
+            raise TypeError("All attribute keys must be strings")
+        if (
+            type(value) not in _ATTR_EXACT_TYPES
+            and not isinstance(value, _ATTR_TYPES)
+        ):
+            raise TypeError(
+                "All attribute values must be either strings, integers, "
+                "floats or booleans"
+            )
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the sets used for tags, which json can't handle natively."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
 
-class SetEncoder(json.JSONEncoder):
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, set):
-            return list(obj)
-        return json.JSONEncoder.default(self, obj)
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to json. Uses orjson if it's installed, otherwise
+    falls back to the json module of the standard library.
+
+    orjson raises on integers beyond 64 bits and writes NaN and infinity as
+    null, so the json module takes over then, to store them like it always
+    did (an actual null can't be told apart, but isn't written anyways).
+    """
+    if orjson is not None:
+        try:
+            json_ = orjson.dumps(obj, default=_default)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            if b"null" not in json_:
+                return json_
+    # ensure_ascii is on by default, so the output is plain ASCII
+    return json.dumps(obj, default=_default).encode("ascii")
+
+
+def _file_state(stat: os.stat_result) -> FILE_STATE:
+    """What tells if a file was changed or replaced since it was stat'ed."""
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _dump(obj: Any, fp: BinaryIO) -> None:
+    """
+    Serialize an object as json into a binary file. Without orjson, the
+    chunks of the json module's encoder are streamed into the file instead
+    of building the whole output in memory first.
+    """
+    if orjson is not None:
+        fp.write(_dumps(obj))
+        return
+    # ensure_ascii is on by default, so every chunk is plain ASCII
+    for chunk in json.JSONEncoder(default=_default).iterencode(obj):
+        fp.write(chunk.encode("ascii"))
+
+
+def _loads(json_: Union[bytes, str]) -> Any:
+    """
+    Deserialize json, using orjson if it's installed. The json module reads
+    what orjson can't: NaN and infinity, and integers beyond 64 bits (which
+    orjson would turn into floats).
+    """
+    if orjson is not None:
+        if isinstance(json_, str):
+            long_digits = _LONG_DIGITS_RE.search(json_)
+        else:
+            long_digits = _LONG_DIGITS_BYTES_RE.search(json_)
+        if long_digits is None:
+            try:
+                return orjson.loads(json_)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(json_)
+
+
+def _skip_ws(json_: str, pos: int) -> int:
+    """Skip json whitespace, returning the position of the next token."""
+    return _WS_RE.match(json_, pos).end()  # type: ignore[union-attr]
+
+
+def _split_structure(json_: str) -> tuple[dict[str, Any], Optional[str]]:
+    """
+    Parse the json of a database file, except for the data entries if they
+    come last (as written by `Database.build_structure()`). Those are
+    returned as unparsed json instead, so they can be parsed when needed.
+    Otherwise, or if the json is malformed, the whole file gets parsed at once,
+    raising the usual `ValueError` if it's invalid.
+
+    Only the end of the file is checked for the deferred data entries, so
+    malformed entries are only noticed once those are parsed.
+
+    :param json_: The contents of a database file
+    :type json_: str
+    :return: The parsed structure and the unparsed data entries, if deferred
+    :rtype: tuple[dict[str, Any], Optional[str]]
+    """
+    structure: dict[str, Any] = {}
+    try:
+        pos = _skip_ws(json_, 0)
+        if json_[pos] != "{":
+            raise ValueError("Expecting '{'")
+        pos += 1
+        while True:
+            key, pos = _DECODER.raw_decode(json_, _skip_ws(json_, pos))
+            pos = _skip_ws(json_, pos)
+            if json_[pos] != ":":
+                raise ValueError("Expecting ':'")
+            pos = _skip_ws(json_, pos + 1)
+            if key == "data":
+                # Nothing but the closing brace should follow the data
+                end = json_.rstrip()
+                data = end[pos:-1].rstrip()
+                if (
+                    _HEADER_KEYS.issubset(structure)
+                    and end.endswith("}")
+                    and data.startswith("[")
+                    and data.endswith("]")
+                ):
+                    return structure, data
+                raise ValueError("Expecting data to be the last key")
+            structure[key], pos = _DECODER.raw_decode(json_, pos)
+            pos = _skip_ws(json_, pos)
+            if json_[pos] != ",":
+                break
+            pos += 1
+    except (IndexError, ValueError):
+        pass
+    return _loads(json_), None
 
 
 class Database:
+    # Fixed attribute slots instead of an instance __dict__
+    __slots__ = (
+        "path",
+        "_tags",
+        "_enforce_tags",
+        "_backups_enabled",
+        "_data_text",
+        "_tags_list",
+        "_tag_sets",
+        "_attrs_list",
+        "_data_text_lower",
+        "_raw_data",
+        "_tag_index",
+        "_data_index",
+        "_dirty",
+        "_cached_bytes",
+        "_wal_id",
+        "_file_state",
+        "_wal_size",
+        "_pending_ops",
+        "_deferred_ops",
+        "_replaying",
+    )
+
     def __init__(
         self,
         name: str,
@@ -53,16 +316,67 @@ class Database:
         dir = Path(dir)
 
         self.path = dir / (name + ".jsondb")
-        if self.path.exists():
+        # If the directory has to be created, the database can't exist yet.
+        # Like before, its parent has to exist
+        with suppress(FileExistsError):
+            os.mkdir(dir)
+        try:
+            # Creating exclusively also rules out a race with another process.
+            # The mode is the one of `Path.touch()`, so the umask applies
+            fd = os.open(
+                self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666
+            )
+        except FileExistsError:
             raise FileExistsError(f"The file {self.path} already exists.")
-        dir.mkdir(exist_ok=True)
-        self.path.touch()
+        os.close(fd)
+
+        # A new database, see `empty()`
+        self._init_state(self.path, set(), False, False, None, None)
+        # The file is still empty
+        self._dirty = True
 
-        self._structure: STRUCTURE = self.empty()
-        self._tags: TAGS = self._structure["tags"]  # type: ignore[assignment]
-        self._enforce_tags: bool = self._structure["enforce_tags"]  # type: ignore[assignment] # noqa
-        self._backups_enabled: bool = self._structure["backups_enabled"]  # type: ignore[assignment] # noqa
-        self._data: DATA = self._structure["data"]  # type: ignore[assignment]
+    def _init_state(
+        self,
+        path: Path,
+        tags: TAGS,
+        enforce_tags: ENFORCE_TAGS,
+        backups_enabled: BACKUPS_ENABLED,
+        wal_id: WAL_ID,
+        raw_data: Optional[str],
+    ) -> None:
+        """Initialize all attributes of a database without entries."""
+        self.path = path
+        self._tags = tags
+        self._enforce_tags = enforce_tags
+        self._backups_enabled = backups_enabled
+        # Entries are stored as parallel lists, so scans only touch the field
+        # they actually need
+        self._data_text: list[str] = []
+        self._tags_list: list[ENTRY_TAGS] = []
+        # Identical tag combinations of entries share one frozenset, see
+        # `_intern()`
+        self._tag_sets: dict[ENTRY_TAGS, ENTRY_TAGS] = {}
+        self._attrs_list: list[ATTRS] = []
+        self._data_text_lower: Optional[list[str]] = None
+        # The unparsed json of the entries, until they're first accessed
+        self._raw_data = raw_data
+        self._tag_index: Optional[TAG_INDEX] = None
+        # Maps every data string to the index of its first occurrence
+        self._data_index: Optional[DATA_INDEX] = None
+        # Whether there are changes that haven't been saved yet
+        self._dirty = False
+        # The json representation, until the next change invalidates it
+        self._cached_bytes: Optional[bytes] = None
+        # Identifies the write-ahead log belonging to the saved file
+        self._wal_id = wal_id
+        # The database file and the length of its log as last read or
+        # written by this object, to notice changes by other processes
+        self._file_state: Optional[FILE_STATE] = None
+        self._wal_size = 0
+        self._pending_ops: list[tuple[Any, ...]] = []
+        # Logged changes of the entries, replayed once they're parsed
+        self._deferred_ops: list[bytes] = []
+        self._replaying = False
 
     @classmethod
     @contextmanager
@@ -73,14 +387,18 @@ class Database:
         :yield: A fully initialized database object
         :rtype: Database
         """
-        path = Path(path)
-
-        with open(path, "r", encoding="utf-8") as fp:
-            json_ = fp.read()
+        db = cls._read(Path(path))
+        try:
+            yield db
+        finally:
+            db.save()
 
-        db = Database.__new__(Database)
-        db.path = path
-        structure = json.loads(json_)
+    @classmethod
+    def _read(cls, path: Path) -> "Database":
+        """Read a database file and apply its write-ahead log."""
+        with open(path, "rb") as fp:
+            structure, raw_data = _split_structure(fp.read().decode("utf-8"))
+            file_state = _file_state(os.fstat(fp.fileno()))
 
         if __version__ < tuple(map(int, structure["version"].split("."))):
             print(
@@ -89,66 +407,344 @@ class Database:
                 f"currently installed ({version_string}). Please consider "
                 "upgrading."
             )
-        db._structure = structure
-        db._tags = set(structure["tags"])
-        db._enforce_tags = structure["enforce_tags"]
-        db._backups_enabled = structure["backups_enabled"]
-        db._data = structure["data"]
-
-        if db.backups_enabled:
-            backup_keep_count_evar = os.getenv("JSONDB_BACKUP_KEEP_COUNT")
-            try:
-                backup_keep_count = int(str(backup_keep_count_evar))
-            except ValueError:
-                backup_keep_count = 50
-            backup_dir = path.parent / f".jsondb_backups_{path.stem}"
-            backup_dir.mkdir(exist_ok=True)
-            timestamp = int(time.time())
-            with open(
-                backup_dir / f".jsondb_backup_{path.stem}_{timestamp}.jsondb",
-                mode="w",
-                encoding="utf-8",
-            ) as fp:
-                fp.write(json_)
-            backup_files = list(backup_dir.iterdir())
-            valid_backup_files: dict[Path, int] = {}
-            for file in backup_files:
-                if file.name.startswith(f".jsondb_backup_{path.stem}_"):
-                    try:
-                        time_ = int(file.name.split(".")[1].split("_")[-1])
-                    except ValueError:
-                        continue
-                    valid_backup_files[file] = time_
-            if len(valid_backup_files) > backup_keep_count:
-                valid_sorted = [
-                    k for k, v in sorted(
-                        valid_backup_files.items(),
-                        key=lambda item: item[1],
-                        reverse=False,
-                    )
-                ]
-                while len(valid_sorted) > backup_keep_count:
-                    valid_sorted[0].unlink()
-                    del valid_sorted[0]
+        db = cls.__new__(cls)
+        # Parsing the entries is deferred until they're first needed
+        db._init_state(
+            path,
+            set(structure["tags"]),
+            structure["enforce_tags"],
+            structure["backups_enabled"],
+            structure.get("wal_id"),
+            raw_data,
+        )
+        db._file_state = file_state
+        if raw_data is None:
+            db._unpack_data(structure["data"])
+        db._replay_wal()
+        return db
 
+    @property
+    def _wal_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".wal")
+
+    def _replay_wal(self) -> None:
+        """
+        Apply the changes from the write-ahead log next to the database file.
+        A log left over from before the file was last rewritten is removed.
+        """
         try:
-            yield db
+            with open(self._wal_path, "rb") as fp:
+                wal = fp.read()
+        except FileNotFoundError:
+            return
+        # Only newline-terminated lines are complete, anything after the last
+        # newline is left over from an interrupted write
+        complete, _, incomplete = wal.rpartition(b"\n")
+        lines = complete.split(b"\n")
+        try:
+            wal_id = _loads(lines[0])["wal_id"]
+        except (KeyError, TypeError, ValueError):
+            wal_id = None
+        if wal_id is None or wal_id != self._wal_id:
+            os.unlink(self._wal_path)
+            return
+        self._wal_size = len(complete) + 1
+        if incomplete:
+            os.truncate(self._wal_path, self._wal_size)
+        self._replay_lines(lines[1:])
+
+    def _replay_lines(
+        self, lines: list[bytes], entries_only: bool = False
+    ) -> None:
+        """
+        Apply lines of the write-ahead log. While the entries haven't been
+        parsed yet, the changes of them are put aside for `_load_data()`.
+
+        :param lines: The logged changes, one json array each
+        :type lines: list[bytes]
+        :param entries_only: Whether those are the put aside changes of the
+            entries, defaults to False
+        :type entries_only: bool, optional
+        """
+        self._replaying = True
+        try:
+            for line in lines:
+                if (
+                    self._raw_data is not None
+                    and line.startswith(_ENTRY_OP_PREFIXES)
+                ):
+                    self._deferred_ops.append(line)
+                    continue
+                op, *args = _loads(line)
+                self._replay(op, args)
+        except (AttributeError, IndexError, KeyError, TypeError,
+                ValueError) as e:
+            # The changes of the tags were applied when opening already
+            changes = "Changes to the entries" if entries_only else "Changes"
+            print(
+                f"[WARNING] The write-ahead log of the database at "
+                f"{self.path} is damaged ({e}). {changes} that were logged "
+                "after that are discarded."
+            )
+            # Rewrite the database file with what could be replayed
+            self._wal_id = None
+            self._dirty = True
         finally:
-            db.save()
+            self._replaying = False
 
     def save(self) -> None:
-        with open(self.path, "w", encoding="utf-8") as fp:
-            json.dump(self.build_structure(), fp, cls=SetEncoder)
+        """
+        Save all changes since the database was opened or last saved. Does
+        nothing if there weren't any.
+
+        The changes are appended to a write-ahead log (<database>.jsondb.wal)
+        next to the database file. The database file itself is only rewritten
+        (which clears the log) once the log exceeds `WAL_COMPACTION_RATIO` of
+        the database file's size, or always when backups are enabled, so
+        those stay complete snapshots.
+
+        If another process changed the database file or its log in the
+        meantime, the logged changes may not apply to it anymore, which is
+        why the database file is rewritten then as well. Just like without
+        the log, the last one to save wins.
+        """
+        if not self._dirty:
+            return
+        if (
+            self._backups_enabled
+            or self._wal_id is None
+            or self._changed_on_disk()
+        ):
+            self._write_file()
+        else:
+            wal = self._encode_pending_ops()
+            if wal is None:
+                self._write_file()
+            else:
+                self._append_wal(wal)
+        self._pending_ops.clear()
+        self._dirty = False
+
+    def _changed_on_disk(self) -> bool:
+        """
+        Whether the database file or its log were changed since this object
+        last read or wrote them.
+        """
+        try:
+            file_state = _file_state(os.stat(self.path))
+        except FileNotFoundError:
+            return True
+        try:
+            wal_size = os.path.getsize(self._wal_path)
+        except FileNotFoundError:
+            wal_size = 0
+        return file_state != self._file_state or wal_size != self._wal_size
+
+    def _encode_pending_ops(self) -> Optional[bytes]:
+        """
+        Encode the pending changes as lines of the write-ahead log. Gives up
+        and returns None as soon as the log would exceed
+        `WAL_COMPACTION_RATIO` of the database file's size, as the database
+        file gets rewritten then anyways.
+        """
+        file_size = self._file_state[1]  # type: ignore[index]
+        space = WAL_COMPACTION_RATIO * file_size - self._wal_size
+        lines = []
+        for op in self._pending_ops:
+            line = _dumps(op) + b"\n"
+            space -= len(line)
+            if space < 0:
+                return None
+            lines.append(line)
+        return b"".join(lines)
+
+    def _write_file(self) -> None:
+        """Rewrite the database file and remove the write-ahead log."""
+        # A new id makes sure an old log is never applied to the new file,
+        # even if removing it below fails
+        self._wal_id = uuid.uuid4().hex
+        self._cached_bytes = None
+        # Write to a temporary file that replaces the database file at once,
+        # so it is never left half-written
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as fp:
+            if self._raw_data is not None and not self._deferred_ops:
+                # Splices the untouched entries back in, see
+                # `build_structure_bytes()`
+                fp.write(self.build_structure_bytes())
+            else:
+                _dump(self.build_structure(), fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        if self._backups_enabled:
+            self._backup()
+        os.replace(tmp_path, self.path)
+        self._file_state = _file_state(os.stat(self.path))
+        with suppress(FileNotFoundError):
+            os.unlink(self._wal_path)
+        self._wal_size = 0
+
+    def _append_wal(self, wal: bytes) -> None:
+        """Append encoded changes to the write-ahead log."""
+        with open(self._wal_path, "ab") as fp:
+            if fp.tell() == 0:
+                fp.write(_dumps({"wal_id": self._wal_id}) + b"\n")
+            fp.write(wal)
+            fp.flush()
+            os.fsync(fp.fileno())
+            self._wal_size = fp.tell()
+
+    def _backup(self) -> None:
+        """
+        Back up the database as it currently is on disk into the
+        .jsondb_backups_<database> folder, right before `save()` replaces
+        the database file. Changes from its write-ahead log are included.
+        The oldest backups are removed so only `JSONDB_BACKUP_KEEP_COUNT`
+        (default 50) of them are kept.
+        """
+        path = self.path
+        backup_keep_count_evar = os.getenv("JSONDB_BACKUP_KEEP_COUNT")
+        try:
+            backup_keep_count = int(str(backup_keep_count_evar))
+        except ValueError:
+            backup_keep_count = 50
+        backup_dir = path.parent / f".jsondb_backups_{path.stem}"
+        backup_dir.mkdir(exist_ok=True)
+        timestamp = int(time.time())
+        backup_path = (
+            backup_dir / f".jsondb_backup_{path.stem}_{timestamp}.jsondb"
+        )
+        if self._wal_path.exists():
+            # The database file misses the changes in the log
+            snapshot = Database._read(path)
+            with open(backup_path, "wb") as fp:
+                fp.write(snapshot.build_structure_bytes())
+        else:
+            # The database file gets replaced by a new one afterwards, so the
+            # backup can simply keep the current one
+            try:
+                os.link(path, backup_path)
+            except OSError:
+                # Cross-device, unsupported by the file system or a backup
+                # from the same second that gets overwritten
+                shutil.copyfile(path, backup_path)
+        valid_backup_files: list[tuple[int, os.DirEntry[str]]] = []
+        with os.scandir(backup_dir) as it:
+            for entry in it:
+                match = _BACKUP_RE.match(entry.name)
+                if match and match.group(1) == path.stem:
+                    valid_backup_files.append((int(match.group(2)), entry))
+        excess = len(valid_backup_files) - backup_keep_count
+        if excess > 0:
+            valid_backup_files.sort(key=lambda item: item[0])
+            for _, entry in valid_backup_files[:excess]:
+                os.unlink(entry.path)
+
+    def _load_data(self) -> None:
+        """
+        Parse the entries and apply their logged changes, if that was
+        deferred when opening.
+        """
+        if self._raw_data is not None:
+            try:
+                data = _loads(self._raw_data)
+            except ValueError as e:
+                raise ValueError(
+                    f"The data entries of the database at {self.path} are "
+                    f"malformed: {e}"
+                ) from e
+            self._raw_data = None
+            self._unpack_data(data)
+            lines, self._deferred_ops = self._deferred_ops, []
+            self._replay_lines(lines, entries_only=True)
+
+    def _intern(self, tags: Iterable[str]) -> ENTRY_TAGS:
+        """Get the shared frozenset for a combination of entry tags."""
+        tag_set = frozenset(tags)
+        return self._tag_sets.setdefault(tag_set, tag_set)
+
+    def _unpack_data(self, data: DATA) -> None:
+        """Append entries to the parallel lists holding them."""
+        intern = self._intern
+        for text, tags, attrs in data:
+            self._data_text.append(text)
+            self._tags_list.append(intern(tags))
+            self._attrs_list.append(attrs)
 
     def build_structure(self) -> STRUCTURE:
+        self._load_data()
+        # The data comes last, so it can be skipped when opening the file
+        return {
+            **self._build_header(),
+            "data": list(
+                zip(self._data_text, self._tags_list, self._attrs_list)
+            ),
+        }
+
+    def _build_header(self) -> STRUCTURE:
+        """The structure without the data entries."""
         return {
             "tags": self._tags,
             "enforce_tags": self._enforce_tags,
             "backups_enabled": self._backups_enabled,
-            "data": self._data,
             "version": ".".join(map(str, __version__)),
+            "wal_id": self._wal_id,
         }
 
+    def build_structure_bytes(self) -> bytes:
+        """
+        The json representation of the database. It's cached until the next
+        change, so saving or calculating the size repeatedly is cheap.
+        """
+        if self._cached_bytes is None:
+            if self._raw_data is None or self._deferred_ops:
+                self._cached_bytes = _dumps(self.build_structure())
+            else:
+                # The entries weren't touched, so reuse their json as read
+                header = _dumps(self._build_header())
+                self._cached_bytes = b"".join((
+                    header[:-1],
+                    b',"data":',
+                    self._raw_data.encode("utf-8"),
+                    b"}",
+                ))
+        return self._cached_bytes
+
+    def _changed(self, op: str, *args: Any) -> None:
+        """
+        Mark the database as modified and record the change for the
+        write-ahead log. Called by every mutating method with its name and
+        the arguments needed to replay it, before anything is modified.
+        The change is only encoded if it actually gets appended to the log.
+        """
+        if self._replaying:
+            return
+        self._dirty = True
+        self._cached_bytes = None
+        self._pending_ops.append((op, *args))
+
+    def _replay(self, op: str, args: list[Any]) -> None:
+        """
+        Apply a change recorded by `_changed()`. The entries are changed
+        without validating them again, they were valid when they were logged.
+        """
+        if op == "set":
+            data, tags, attrs = args
+            self._append_entry(data, self._intern(tags), attrs)
+        elif op == "unset":
+            (index,) = args
+            self._remove_entry(index)
+        elif op == "edit_id":
+            index, data, tags, attrs = args
+            self._edit_entry(index, data, self._intern(tags), attrs)
+        elif op in ("enforce_tags", "backups_enabled"):
+            (value,) = args
+            setattr(self, f"_{op}", value)
+        elif op in _TAG_OPS:
+            getattr(self, op)(*args)
+        else:
+            raise ValueError(f"Unknown operation {op!r}")
+
     @property
     def enforce_tags(self) -> bool:
         """
@@ -161,6 +757,7 @@ class Database:
     def enforce_tags(self, value: bool) -> None:
         if not isinstance(value, bool):
             raise TypeError("enforce_tags must be a boolean")
+        self._changed("enforce_tags", value)
         self._enforce_tags = value
 
     @property
@@ -175,6 +772,7 @@ class Database:
     def backups_enabled(self, value: bool) -> None:
         if not isinstance(value, bool):
             raise TypeError("backups_enabled must be a boolean")
+        self._changed("backups_enabled", value)
         self._backups_enabled = value
 
     @property
@@ -187,16 +785,15 @@ class Database:
         """
         The number of data entries being present in the database. Read-only.
         """
-        return len(self._data)
+        self._load_data()
+        return len(self._data_text)
 
     def calc_bytes(self) -> int:
         """
-        Calculate the amount of bytes the json representation takes up in
-        memory.
+        Calculate the amount of bytes the json representation takes up when
+        encoded.
         """
-        return sys.getsizeof(
-            json.dumps(self.build_structure(), cls=SetEncoder)
-        )
+        return len(self.build_structure_bytes())
 
     def add_tag(self, tag: str) -> None:
         """
@@ -210,7 +807,9 @@ class Database:
         """
         if not isinstance(tag, str):
             raise TypeError("tag must be a string")
-        self._tags.add(tag)
+        if tag not in self._tags:
+            self._changed("add_tag", tag)
+            self._tags.add(tag)
 
     def rm_tag(self, tag: str) -> None:
         """
@@ -221,16 +820,17 @@ class Database:
         not in the list of tags.
         :type tag: str
         """
-        try:
+        if tag in self._tags:
+            self._changed("rm_tag", tag)
             self._tags.remove(tag)
-        except KeyError:
-            pass
 
     def clear_tags(self) -> None:
         """
         Clear all tags from the list of allowed tags.
         """
-        self._tags.clear()
+        if self._tags:
+            self._changed("clear_tags")
+            self._tags.clear()
 
     def add_tags(self, tags: Iterable[str]) -> None:
         """
@@ -240,11 +840,18 @@ class Database:
 
         :param tags: A list of tags to be added all at once
         :type tags: list[str]
+        :raises TypeError: At least one tag isn't a string
         """
-        for tag in tags:
-            self.add_tag(tag)
+        tags = set(tags)
+        if not all(isinstance(tag, str) for tag in tags):
+            raise TypeError("tag must be a string")
+        # Only log and save the tags that are actually new
+        tags -= self._tags
+        if tags:
+            self._changed("add_tags", tags)
+            self._tags.update(tags)
 
-    def rm_tags(self, tags: list[str]) -> None:
+    def rm_tags(self, tags: Iterable[str]) -> None:
         """
         Remove multiple tags at once.
 
@@ -253,8 +860,10 @@ class Database:
         :param tags: A list of tags to be removed all at once.
         :type tags: list[str]
         """
-        for tag in tags:
-            self.rm_tag(tag)
+        tags = self._tags.intersection(tags)
+        if tags:
+            self._changed("rm_tags", tags)
+            self._tags.difference_update(tags)
 
     def set(
         self,
@@ -282,27 +891,40 @@ class Database:
         """
         if not isinstance(data, str):
             raise TypeError("data must be a string")
-        for tag in tags:
-            if not isinstance(tag, str):
-                raise TypeError("All tags must be strings")
-            if self.enforce_tags:
-                if tag not in self._tags:
-                    raise ValueError(f"Tag {tag} not in allowed tags")
-        for key, value in attrs.items():
-            if not isinstance(key, str):
-                raise TypeError("All attribute keys must be strings")
-            if (
-                not isinstance(value, str)
-                and not isinstance(value, int)
-                and not isinstance(value, float)
-                and not isinstance(value, bool)
-            ):
-                raise TypeError(
-                    "All attribute values must be either strings, integers, "
-                    "floats or booleans"
+        tag_set = frozenset(tags)
+        if not all(isinstance(tag, str) for tag in tag_set):
+            raise TypeError("All tags must be strings")
+        if self._enforce_tags:
+            missing = tag_set - self._tags
+            if missing:
+                raise ValueError(
+                    f"Tags {', '.join(missing)} not in allowed tags"
                 )
+        _check_attrs(attrs)
 
-        self._data.append((data, set(tags), attrs))
+        tag_set = self._intern(tag_set)
+        self._load_data()
+        self._changed("set", data, tag_set, attrs)
+        self._append_entry(data, tag_set, attrs)
+
+    def _append_entry(
+        self,
+        data: str,
+        tags: ENTRY_TAGS,
+        attrs: ATTRS,
+    ) -> None:
+        """Append an entry that has already been validated."""
+        self._data_text.append(data)
+        self._tags_list.append(tags)
+        self._attrs_list.append(attrs)
+        if self._data_text_lower is not None:
+            self._data_text_lower.append(data.lower())
+        index = len(self._data_text) - 1
+        if self._tag_index is not None:
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(index)
+        if self._data_index is not None:
+            self._data_index.setdefault(data, index)
 
     def unset(self, index: int) -> None:
         """
@@ -315,10 +937,24 @@ class Database:
         """
         if not isinstance(index, int):
             raise TypeError("index must be an integer")
+        self._load_data()
         try:
-            del self._data[index]
+            index = range(len(self._data_text))[index]
         except IndexError:
             raise IndexError(f"Index {index} does not exist")
+        self._changed("unset", index)
+        self._remove_entry(index)
+
+    def _remove_entry(self, index: int) -> None:
+        """Remove the entry at an index."""
+        del self._data_text[index]
+        del self._tags_list[index]
+        del self._attrs_list[index]
+        if self._data_text_lower is not None:
+            del self._data_text_lower[index]
+        # All following indices have shifted, rebuild on the next lookup
+        self._tag_index = None
+        self._data_index = None
 
     def id(
         self,
@@ -342,23 +978,42 @@ class Database:
         :return: Index of the data string
         :rtype: int
         """
-        for i, entry in enumerate(self._data):
-            if not case_insensitive:
-                if not contains:
-                    if data == entry[0]:
-                        return i
-                else:
-                    if data in entry[0]:
-                        return i
-            else:
-                if not contains:
-                    if data.lower() == entry[0].lower():
-                        return i
-                else:
-                    if data.lower() in entry[0].lower():
-                        return i
+        self._load_data()
+        if not contains and not case_insensitive:
+            if self._data_index is None:
+                self._data_index = self._build_data_index()
+            try:
+                return self._data_index[data]
+            except KeyError:
+                raise ValueError(f"'{data}' is not in the database.") from None
+        if case_insensitive:
+            if self._data_text_lower is None:
+                self._data_text_lower = [
+                    text.lower() for text in self._data_text
+                ]
+            texts = self._data_text_lower
+            search = data.lower()
         else:
+            texts = self._data_text
+            search = data
+        if not contains:
+            try:
+                return texts.index(search)
+            except ValueError:
+                raise ValueError(f"'{data}' is not in the database.") from None
+        index = next(
+            (i for i, text in enumerate(texts) if search in text), None
+        )
+        if index is None:
             raise ValueError(f"'{data}' is not in the database.")
+        return index
+
+    def _build_data_index(self) -> DATA_INDEX:
+        """Map every data string to the index it first occurs at."""
+        data_index: DATA_INDEX = {}
+        for i, text in enumerate(self._data_text):
+            data_index.setdefault(text, i)
+        return data_index
 
     def query(self, tags: Iterable[str]) -> list[int]:
         """
@@ -369,12 +1024,25 @@ class Database:
         :return: A list of indices where the queried data can be found
         :rtype: list[int]
         """
-        ids: list[int] = []
+        self._load_data()
         tags = set(tags)
-        for i, entry in enumerate(self._data):
-            if tags.issubset(entry[1]):
-                ids.append(i)
-        return ids
+        if not tags:
+            return list(range(len(self._data_text)))
+        if self._tag_index is None:
+            self._tag_index = self._build_tag_index()
+        # Intersect starting with the smallest set of matching indices
+        postings = sorted(
+            (self._tag_index.get(tag, set()) for tag in tags), key=len
+        )
+        return sorted(postings[0].intersection(*postings[1:]))
+
+    def _build_tag_index(self) -> TAG_INDEX:
+        """Map every tag in use to the indices of the entries carrying it."""
+        tag_index: TAG_INDEX = {}
+        for i, tags in enumerate(self._tags_list):
+            for tag in tags:
+                tag_index.setdefault(tag, set()).add(i)
+        return tag_index
 
     def at_index(self, index: int) -> DATA_ENTRY:
         """
@@ -383,12 +1051,17 @@ class Database:
         :param index: The index/id where the data entry lies at
         :type index: int
         :raises IndexError: The specified index is not in the database
-        :return: A tuple of the data string, the set of tags and the attributes
-        dictionary
+        :return: A tuple of the data string, the frozenset of tags and the
+        attributes dictionary
         :rtype: DATA_ENTRY
         """
+        self._load_data()
         try:
-            out = self._data[index]
+            out = (
+                self._data_text[index],
+                self._tags_list[index],
+                self._attrs_list[index],
+            )
         except IndexError:
             err = IndexError(f"Index {index} does not exist")
             err.add_note(str(index))
@@ -448,53 +1121,18 @@ class Database:
         else:
             final_fmt_string = fmt_string
 
-        RE_ID = r"%id\((\d*)(,\s*\"(.*?)\")?\)"  # Group 1: WIDTH | Group 3: FILL_CHAR  # noqa
-        RE_DATA = r"%data\((\d*)(,\s*\"(.*?)\")?\)"  # Group 1: WIDTH | Group 3: FILL_CHAR  # noqa
-        RE_TAGS = r"%tags\(\"(.*?)\"\)"  # Group 1: SEP
-        RE_ATTRS = r"%attrs\(\"(.*?)\",\s*\"(.*?)\"\)"  # Group 1: SEP1 | Group 2: SEP2  # noqa
-
-        match_id = re.search(RE_ID, final_fmt_string)
-        match_data = re.search(RE_DATA, final_fmt_string)
-        match_tags = re.search(RE_TAGS, final_fmt_string)
-        match_attrs = re.search(RE_ATTRS, final_fmt_string)
-
+        parts = _compile_fmt(final_fmt_string)
         lines = []
 
         for i, id in enumerate(ids):
             if not isinstance(id, int):
                 raise TypeError("ids must be an iterable of integers")
             entry = self.at_index(id)  # May raise IndexError
-
-            line = final_fmt_string
-            if match_id:
-                id_to_embed = id if use_real_ids else i
-                width = match_id.group(1)
-                filler = match_id.group(3) or 0
-                line = line.replace(
-                    match_id.group(0), f"{id_to_embed:{filler}>{width}}"
-                )
-            if match_data:
-                width = match_data.group(1)
-                filler = match_data.group(3) or " "
-                data = entry[0]
-                line = line.replace(
-                    match_data.group(0), f"{data:{filler}<{width}}"
-                )
-            if match_tags:
-                sep = match_tags.group(1)
-                line = line.replace(
-                    match_tags.group(0), sep.join(entry[1])
-                )
-            if match_attrs:
-                sep1 = match_attrs.group(1)
-                sep2 = match_attrs.group(2)
-                attrs_strings: list[str] = []
-                for key, value in entry[2].items():
-                    attrs_strings.append(f"{key}{sep1}{value}")
-                line = line.replace(
-                    match_attrs.group(0), sep2.join(attrs_strings)
-                )
-            lines.append(line)
+            id_to_embed = id if use_real_ids else i
+            lines.append("".join([
+                part if isinstance(part, str) else part(id_to_embed, entry)
+                for part in parts
+            ]))
 
         return "\n".join(lines)
 
@@ -506,7 +1144,8 @@ class Database:
         attrs: Optional[ATTRS] = None,
     ) -> None:
         """
-        Edit a database entry by overriding everything specified.
+        Edit a database entry by overriding everything specified. Everything
+        that is None is kept as it is.
 
         :param id: The id of the entry to update
         :type id: int
@@ -516,43 +1155,147 @@ class Database:
         :type tags: Optional[Iterable[str]], optional
         :param attrs: The new attributes, defaults to None
         :type attrs: Optional[ATTRS], optional
+        :raises TypeError: At least one attribute is invalid, see `set()`
         """
+        if attrs is not None:
+            _check_attrs(attrs)
         entry = self.at_index(id)
-        if self.enforce_tags:
-            tags_ = set(tags or entry[1]).intersection(self.tags)
-        else:
-            tags_ = set(tags or entry[1])
-        new_entry = (
-            data or entry[0],
-            tags_,
-            attrs or entry[2],
+        data_ = entry[0] if data is None else data
+        tags_ = entry[1] if tags is None else self._intern(tags)
+        attrs_ = entry[2] if attrs is None else attrs
+        if self._enforce_tags and not tags_.issubset(self._tags):
+            tags_ = self._intern(tags_ & self._tags)
+        # The stored attributes may have been changed in place and passed
+        # back, so they only count as unchanged if they are another dict
+        attrs_unchanged = attrs is None or (
+            attrs is not entry[2] and attrs == entry[2]
         )
-        self._data[id] = new_entry
+        # Interned tags are identical if they're equal
+        if data_ == entry[0] and tags_ is entry[1] and attrs_unchanged:
+            return
+        index = range(len(self._data_text))[id]  # Resolve negative ids
+        self._changed("edit_id", index, data_, tags_, attrs_)
+        self._edit_entry(index, data_, tags_, attrs_)
+
+    def _edit_entry(
+        self,
+        index: int,
+        data: str,
+        tags: ENTRY_TAGS,
+        attrs: ATTRS,
+    ) -> None:
+        """Replace the entry at a non-negative index with the given values."""
+        self._load_data()
+        old_data = self._data_text[index]
+        old_tags = self._tags_list[index]
+        self._data_text[index] = data
+        self._tags_list[index] = tags
+        self._attrs_list[index] = attrs
+        if self._data_text_lower is not None:
+            self._data_text_lower[index] = data.lower()
+        if self._data_index is not None and data != old_data:
+            # Another entry may now be the first occurrence of the old data
+            self._data_index = None
+        if self._tag_index is not None:
+            for tag in old_tags - tags:
+                self._tag_index[tag].discard(index)
+            for tag in tags - old_tags:
+                self._tag_index.setdefault(tag, set()).add(index)
 
     @staticmethod
     def empty() -> STRUCTURE:
+        """
+        The structure of a new database, in the same shape as
+        `build_structure()` returns it.
+        """
         return {
             "tags": set(),
             "enforce_tags": False,
             "backups_enabled": False,
-            "data": [],
             "version": ".".join(map(str, __version__)),
+            "wal_id": None,
+            # The data comes last, see `build_structure()`
+            "data": [],
         }
 
 
 def init_register_file(clear: bool = False) -> None:
     """
-    Create the .paths register file in the Documents/jsondb directory. If
-    present, this will do nothing.
+    Create the .paths.json register file in the Documents/jsondb directory.
+    Databases registered in the .paths file of older versions are imported,
+    after which that file is renamed to .paths.imported. If present, this
+    will do nothing.
 
     :param clear: This will wipe the current file, defaults to False
     :type clear: bool, optional
     """
     JSONDB_HOME_PATH.mkdir(exist_ok=True)
-    path = JSONDB_HOME_PATH / ".paths"
-    if not path.exists() or clear:
-        with open(path, "w", encoding="utf-8"):
-            pass
+    path = JSONDB_HOME_PATH / ".paths.json"
+    if path.exists() and not clear:
+        return
+    dbs: dict[str, str] = {}
+    legacy_path = JSONDB_HOME_PATH / ".paths"
+    if not clear and legacy_path.exists():
+        with open(legacy_path, "r", encoding="utf-8") as fp:
+            for line in fp.read().splitlines():
+                if line:
+                    dbs.setdefault(_stem_of(line), line)
+    _store_paths(dbs)
+    if not clear and legacy_path.exists():
+        os.replace(legacy_path, legacy_path.with_name(".paths.imported"))
+
+
+def _load_paths() -> dict[str, str]:
+    """
+    Read the .paths.json register file, creating it if necessary. The result
+    is cached and only read again once the file has been modified. A damaged
+    register file is treated as empty.
+
+    :returns: A mapping of database names to their file paths
+    :rtype: dict[str, str]
+    """
+    global _PATHS_CACHE
+    path = JSONDB_HOME_PATH / ".paths.json"
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        init_register_file()
+        mtime = os.stat(path).st_mtime_ns
+    if _PATHS_CACHE[0] != mtime:
+        with open(path, "rb") as fp:
+            try:
+                dbs = _loads(fp.read())
+            except ValueError:
+                dbs = None
+        if not isinstance(dbs, dict):
+            print(
+                f"[WARNING] The register file at {path} is damaged. No "
+                "databases are registered until it's written again."
+            )
+            dbs = {}
+        _PATHS_CACHE = (mtime, dbs)
+    return _PATHS_CACHE[1]
+
+
+def _stem_of(path: str) -> str:
+    """The file name without suffix, like `Path.stem` but without a Path."""
+    return os.path.splitext(os.path.basename(path.rstrip()))[0]
+
+
+def _store_paths(dbs: dict[str, str]) -> None:
+    """
+    Replace the .paths.json register file and update the cache.
+
+    :param dbs: A mapping of all database names to their file paths
+    :type dbs: dict[str, str]
+    """
+    global _PATHS_CACHE
+    path = JSONDB_HOME_PATH / ".paths.json"
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as fp:
+        fp.write(_dumps(dbs))
+    os.replace(tmp_path, path)
+    _PATHS_CACHE = (os.stat(path).st_mtime_ns, dbs)
 
 
 def read_register_file() -> list[Path]:
@@ -562,10 +1305,7 @@ def read_register_file() -> list[Path]:
     :returns: A list of database file paths
     :rtype: list[Path]
     """
-    init_register_file()
-    path = JSONDB_HOME_PATH / ".paths"
-    with open(path, "r", encoding="utf-8") as fp:
-        return [i for i in map(Path, fp.readlines()) if i]
+    return list(map(Path, _load_paths().values()))
 
 
 def register_database(db: Union[Path, str]) -> None:
@@ -576,18 +1316,13 @@ def register_database(db: Union[Path, str]) -> None:
     :type db: Union[Path, str]
     :raises RuntimeError: A database with the same name is already registered
     """
-    init_register_file()
     db = Path(db)
-    path = JSONDB_HOME_PATH / ".paths"
-    with open(path, "r", encoding="utf-8") as fp:
-        dbs = fp.readlines()
-    for registered_db in dbs:
-        if Path(registered_db).stem == db.stem:
-            raise RuntimeError(
-                f"A database with name {db.stem} exists already."
-            )
-    with open(path, "a", encoding="utf-8") as fp:
-        fp.write(str(db.resolve()) + "\n")
+    dbs = _load_paths()
+    if db.stem in dbs:
+        raise RuntimeError(
+            f"A database with name {db.stem} exists already."
+        )
+    _store_paths({**dbs, db.stem: str(db.resolve())})
 
 
 def unregister_database(db: str) -> None:
@@ -598,21 +1333,10 @@ def unregister_database(db: str) -> None:
     :type db: str
     :raises RuntimeError: Database wasn't registered
     """
-    init_register_file()
-    path = JSONDB_HOME_PATH / ".paths"
-    with open(path, "r", encoding="utf-8") as fp:
-        dbs = fp.readlines()
-    dbs_filtered = []
-    success = False
-    for i in dbs:
-        if Path(i).stem.strip() != db:
-            dbs_filtered.append(i)
-        else:
-            success = True
-    if not success:
+    dbs = _load_paths()
+    if db not in dbs:
         raise RuntimeError(f"Database {db} wasn't registered")
-    with open(path, "w", encoding="utf-8") as fp:
-        fp.writelines(dbs_filtered)
+    _store_paths({name: file for name, file in dbs.items() if name != db})
 
 
 def find_database(db: str) -> Optional[Path]:
@@ -624,10 +1348,5 @@ def find_database(db: str) -> Optional[Path]:
     :returns: The database file path or None, if not found
     :rtype: Optional[Path]
     """
-    path = JSONDB_HOME_PATH / ".paths"
-    with open(path, "r", encoding="utf-8") as fp:
-        dbs = fp.read().splitlines()
-    for file in dbs:
-        if Path(file).stem == db:
-            return Path(file)
-    return None
+    file = _load_paths().get(db)
+    return Path(file) if file is not None else None
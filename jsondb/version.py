@@ -1,2 +1,2 @@
-__version__ = (1, 0, 3)
+__version__ = (1, 1, 0)
 version_string = f"v{'.'.join(map(str, __version__))}"
@@ -0,0 +1,81 @@
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from jsondb import model
+
+
+class ModelTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_legacy_big_int_round_trip(self) -> None:
+        path = self.dir / "legacy.jsondb"
+        path.write_text(
+            '{"tags": [], "enforce_tags": false, "backups_enabled": false, '
+            '"data": [["x", [], {"big": 100000000000000000000}]], '
+            '"version": "1.0.3"}'
+        )
+        with model.Database.open(path) as db:
+            self.assertEqual(db.at_index(0)[2]["big"], 10 ** 20)
+            db.set("y", big=-(10 ** 30))
+        with model.Database.open(path) as db:
+            self.assertEqual(db.at_index(0)[2]["big"], 10 ** 20)
+            self.assertEqual(db.at_index(1)[2]["big"], -(10 ** 30))
+        self.assertIn("100000000000000000000", path.read_text())
+
+    def test_non_finite_floats_round_trip(self) -> None:
+        db = model.Database("floats", self.dir)
+        db.set("x", nan=math.nan, inf=math.inf)
+        db.save()
+        with model.Database.open(db.path) as db:
+            attrs = db.at_index(0)[2]
+            self.assertTrue(math.isnan(attrs["nan"]))
+            self.assertEqual(attrs["inf"], math.inf)
+
+    def _filled(self, entries: int) -> Path:
+        db = model.Database("shared", self.dir)
+        for i in range(entries):
+            db.set(f"entry {i}")
+        db.save()
+        return db.path
+
+    def test_concurrent_logged_changes(self) -> None:
+        path = self._filled(200)
+        with model.Database.open(path) as first:
+            with model.Database.open(path) as second:
+                first.unset(5)
+                second.unset(5)
+        with model.Database.open(path) as db:
+            self.assertEqual(db.entries, 199)
+
+    def test_log_of_replaced_file(self) -> None:
+        path = self._filled(200)
+        with model.Database.open(path) as first:
+            first.set("from first")
+            with model.Database.open(path) as second:
+                # Saving with backups enabled rewrites the whole file
+                second.backups_enabled = True
+        with model.Database.open(path) as db:
+            self.assertEqual(db.entries, 201)
+            self.assertEqual(db.at_index(-1)[0], "from first")
+
+    def test_edit_attrs_changed_in_place(self) -> None:
+        db = model.Database("edit", self.dir)
+        db.set("x", k=0)
+        db.save()
+        with model.Database.open(db.path) as db:
+            attrs = db.at_index(0)[2]
+            attrs["k"] = 1
+            db.edit_id(0, attrs=attrs)
+        with model.Database.open(db.path) as db:
+            self.assertEqual(db.at_index(0)[2], {"k": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()